@@ -0,0 +1,30 @@
+# Simple Computer Railway Access Module - SCRAM
+#
+# Copy this file and the scram package to the board, or the precompiled .mpy
+# files from make mpy, and the panel starts when the board is reset
+
+from time import ticks_ms
+import gc
+
+from scram.panel import build
+
+if __name__ == '__main__':
+    # Set to a file name to record the button presses of the session so that
+    # it can be replayed with scram_replay
+    record_to = None
+    # Set to True to have the hardware watchdog reset the board if the loop hangs
+    use_watchdog = False
+    
+    panel = build()
+    # Time since reset, the firmware starting up, the imports and building the
+    # panel, and the heap left once the leftovers of building it are collected
+    gc.collect()
+    print('Boot', ticks_ms(), 'ms, free heap', gc.mem_free(), 'bytes')
+    panel.start()
+    if use_watchdog:
+        panel.start_watchdog()
+    if record_to:
+        from scram_replay import SessionRecorder
+        panel.recorder = SessionRecorder(panel.buttons, record_to)
+    
+    panel.run()
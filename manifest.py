@@ -0,0 +1,7 @@
+# Freezes SCRAM into a MicroPython firmware image, build the rp2 port with
+# FROZEN_MANIFEST set to the path of this file. main.py is left on the board
+# file system so the layout can still be changed without a rebuild
+include("$(PORT_DIR)/boards/manifest.py")
+package("scram")
+module("scram_bus.py")
+module("scram_replay.py")
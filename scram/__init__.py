@@ -0,0 +1,7 @@
+# Simple Computer Railway Access Module - SCRAM
+#
+# The package is split so that a board only loads what it uses, nothing is
+# imported here. main.py imports scram.panel, which brings in the scheduler,
+# hardware drivers, points, signals, indicators and routes. The feedback
+# classes are only loaded if points are built with feedback and the tunes are
+# only loaded the first time one is played.
@@ -0,0 +1,69 @@
+from machine import Pin
+
+from scram.scheduler import scheduler
+
+# Accessory outputs, such as frog polarity relays, on a chain of 74HC595 shift
+# registers written over SPI so that they only need three pins however many
+# there are. Outputs are numbered from 0 on the first register in the chain.
+# Setting an output only changes the copy held here, the whole chain is written
+# in one SPI transfer at the end of the scheduler tick in which anything changed
+class ShiftRegisterOutputs:
+    def __init__(self, spi, latch_pin = None, chips = 1):
+        self.spi = spi
+        self.latch = None
+        if latch_pin is not None:
+            self.latch = Pin(latch_pin, Pin.OUT, value = 0)
+        self.chips = chips
+        # In the order they are shifted out, the last register in the chain first
+        self.state = bytearray(chips)
+        # The registers power up holding anything, so the whole chain is written
+        # on the first tick whether or not an output has been set
+        self.changed = True
+        self.transfers = 0
+        scheduler.flush_after_tick(self)
+    
+    def set(self, output, on):
+        ndx = self.chips - 1 - (output >> 3)
+        mask = 1 << (output & 7)
+        if on:
+            value = self.state[ndx] | mask
+        else:
+            value = self.state[ndx] & ~mask
+        if value != self.state[ndx]:
+            self.state[ndx] = value
+            self.changed = True
+    
+    def is_on(self, output):
+        return self.state[self.chips - 1 - (output >> 3)] & (1 << (output & 7)) != 0
+    
+    def flush(self):
+        if not self.changed:
+            return
+        self.changed = False
+        self.spi.write(self.state)
+        # The registers copy what has been shifted in to their outputs on the
+        # rising edge of the latch
+        if self.latch:
+            self.latch.value(1)
+            self.latch.value(0)
+        self.transfers += 1
+
+# Switches the polarity of a live frog as the blades pass the centre, the
+# output is on while the points are over towards reverse
+class FrogPolarity:
+    def __init__(self, points, outputs, output, position = 0):
+        self.outputs = outputs
+        self.output = output
+        points.add_threshold(position, self.crossed)
+    
+    def crossed(self, points, direction):
+        self.outputs.set(self.output, direction > 0)
+
+# Stands in for the SPI bus when the shift registers are not fitted, every
+# transfer is kept so that what would have been written can be checked
+class SimulatedSPI:
+    def __init__(self):
+        self.transfers = []
+    
+    def write(self, buf):
+        self.transfers.append(bytes(buf))
@@ -0,0 +1,145 @@
+class Note:
+    B0 = 31
+    C1 = 33
+    CS1 = 35
+    D1 = 37
+    DS1 = 39
+    E1 = 41
+    F1 = 44
+    FS1 = 46
+    G1 = 49
+    GS1 = 52
+    A1 = 55
+    AS1 = 58
+    B1 = 62
+    C2 = 65
+    CS2 = 69
+    D2 = 73
+    DS2 = 78
+    E2 = 82
+    F2 = 87
+    FS2 = 93
+    G2 = 98
+    GS2 = 104
+    A2 = 110
+    AS2 = 117
+    B2 = 123
+    C3 = 131
+    CS3 = 139
+    D3 = 147
+    DS3 = 156
+    E3 = 165
+    F3 = 175
+    FS3 = 185
+    G3 = 196
+    GS3 = 208
+    A3 = 220
+    AS3 = 233
+    B3 = 247
+    C4 = 262
+    CS4 = 277
+    D4 = 294
+    DS4 = 311
+    E4 = 330
+    F4 = 349
+    FS4 = 370
+    G4 = 392
+    GS4 = 415
+    A4 = 440
+    AS4 = 466
+    B4 = 494
+    C5 = 523
+    CS5 = 554
+    D5 = 587
+    DS5 = 622
+    E5 = 659
+    F5 = 698
+    FS5 = 740
+    G5 = 784
+    GS5 = 831
+    A5 = 880
+    AS5 = 932
+    B5 = 988
+    C6 = 1047
+    CS6 = 1109
+    D6 = 1175
+    DS6 = 1245
+    E6 = 1319
+    F6 = 1397
+    FS6 = 1480
+    G6 = 1568
+    GS6 = 1661
+    A6 = 1760
+    AS6 = 1865
+    B6 = 1976
+    C7 = 2093
+    CS7 = 2217
+    D7 = 2349
+    DS7 = 2489
+    E7 = 2637
+    F7 = 2794
+    FS7 = 2960
+    G7 = 3136
+    GS7 = 3322
+    A7 = 3520
+    AS7 = 3729
+    B7 = 3951
+    C8 = 4186
+    CS8 = 4435
+    D8 = 4699
+    DS8 = 4978
+    REST = 0
+
+class Tunes:
+    tune_index = -1
+    
+    def next():
+        Tunes.tune_index += 1
+        if Tunes.tune_index >= 3:
+            Tunes.tune_index = 0
+        
+        if Tunes.tune_index == 0:
+            return Tunes.hedwig()
+        elif Tunes.tune_index == 1:
+            return Tunes.starwars()
+        elif Tunes.tune_index == 2:
+            return Tunes.startrek()
+        else:
+            return None
+    
+    def hedwig():
+        return (250,
+                [(Note.REST, 2), (Note.D4, 4), (Note.G4, -4), (Note.AS4, 8), (Note.A4, 4), (Note.G4, 2),
+                (Note.D5, 4), (Note.C5, -2), (Note.A4, -2), (Note.G4, -4), (Note.AS4, 8), (Note.A4, 4),
+                (Note.F4, 2), (Note.GS4, 4), (Note.D4, -1), (Note.D4, 4), (Note.G4, -4), (Note.AS4, 8),
+                (Note.A4, 4), (Note.G4, 2), (Note.D5, 4), (Note.F5, 2), (Note.E5, 4), (Note.DS5, 2),
+                (Note.B4, 4), (Note.DS5, -4), (Note.D5, 8), (Note.CS5, 4), (Note.CS4, 2), (Note.B4, 4),
+                (Note.G4, -1), (Note.AS4, 4), (Note.D5, 2), (Note.AS4, 4), (Note.D5, 2), (Note.AS4, 4),
+                (Note.DS5, 2), (Note.D5, 4), (Note.CS5, 2), (Note.A4, 4), (Note.AS4, -4), (Note.D5, 8),
+                (Note.CS5, 4), (Note.CS4, 2), (Note.D4, 4), (Note.D5, -1), (Note.REST, 4), (Note.AS4,4),
+                (Note.D5, 2), (Note.AS4, 4), (Note.D5, 2), (Note.AS4, 4), (Note.F5, 2), (Note.E5, 4),
+                (Note.DS5, 2), (Note.B4, 4), (Note.DS5, -4), (Note.D5, 8), (Note.CS5, 4), (Note.CS4, 2),
+                (Note.AS4, 4), (Note.G4, -1)])
+    
+    def starwars():
+        return (200,
+                [(Note.AS4, 8), (Note.AS4, 8), (Note.AS4, 8), (Note.F5, 2), (Note.C6, 2), (Note.AS5, 8),
+                (Note.A5, 8), (Note.G5, 8), (Note.F6, 2), (Note.C6, 4), (Note.AS5, 8), (Note.A5, 8),
+                (Note.G5, 8), (Note.F6, 2), (Note.C6, 4), (Note.AS5, 8), (Note.A5, 8), (Note.AS5, 8),
+                (Note.G5, 2), (Note.C5, 8), (Note.C5, 8), (Note.C5, 8), (Note.F5, 2), (Note.C6,2),
+                (Note.AS5, 8), (Note.A5, 8), (Note.G5, 8), (Note.F6, 2), (Note.C6, 4), (Note.AS5, 8),
+                (Note.A5, 8), (Note.G5, 8), (Note.F6, 2), (Note.C6, 4), (Note.AS5, 8), (Note.A5, 8),
+                (Note.AS5, 8), (Note.G5, 2), (Note.C5, -8), (Note.C5, 16), (Note.D5, -4), (Note.D5, 8),
+                (Note.AS5, 8), (Note.A5, 8), (Note.G5, 8), (Note.F5, 8), (Note.F5, 8), (Note.G5, 8),
+                (Note.A5, 8), (Note.G5, 4), (Note.D5, 8), (Note.E5, 4), (Note.C5, -8), (Note.C5,16),
+                (Note.D5, -4), (Note.D5, 8), (Note.AS5, 8), (Note.A5, 8), (Note.G5, 8), (Note.F5, 8),
+                (Note.C6, -8), (Note.G5, 16), (Note.G5, 2), (Note.REST, 8), (Note.C5, 8), (Note.D5, -4),
+                (Note.D5, 8), (Note.AS5, 8), (Note.A5, 8), (Note.G5, 8), (Note.F5, 8), (Note.F5, 8),
+                (Note.G5, 8), (Note.A5, 8), (Note.G5, 4), (Note.D5, 8), (Note.E5, 4), (Note.C6, -8),
+                (Note.C6, 16), (Note.F6, 4), (Note.DS6, 8), (Note.CS6, 4), (Note.C6, 8), (Note.AS5, 4),
+                (Note.GS5, 8), (Note.G5, 4), (Note.F5, 8), (Note.C6, 1)])
+
+    def startrek():
+        return (150,
+                [(Note.D4, -8), (Note.G4, 16), (Note.C5, -4), (Note.B4, 8), (Note.G4, -16), (Note.E4, -16),
+                (Note.A4, -16), (Note.D5, 2)])
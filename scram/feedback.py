@@ -0,0 +1,94 @@
+from time import ticks_ms, ticks_diff
+
+# Feedback from the points to say the blades have really arrived. With current
+# sensing the servo draws current until it stops pushing, so arrival is when
+# the ADC reading has stayed under the threshold for quiet_samples readings in
+# a row. Tie bar microswitches close when the blades reach the stock rail,
+# arrival is when the switch for the side being set has read closed for
+# stable_samples readings in a row
+class CurrentFeedback:
+    def __init__(self, adc, threshold = 8000, quiet_samples = 5):
+        self.adc = adc
+        self.threshold = threshold
+        self.quiet_samples = quiet_samples
+        self.quiet_count = 0
+    
+    def reset(self):
+        self.quiet_count = 0
+    
+    def arrived(self, points):
+        if self.adc.read_u16() < self.threshold:
+            self.quiet_count += 1
+        else:
+            self.quiet_count = 0
+        return self.quiet_count >= self.quiet_samples
+
+class SwitchFeedback:
+    def __init__(self, normal_pin, reverse_pin, closed = 0, stable_samples = 3):
+        self.normal_pin = normal_pin
+        self.reverse_pin = reverse_pin
+        self.closed = closed
+        self.stable_samples = stable_samples
+        self.stable_count = 0
+    
+    def reset(self):
+        self.stable_count = 0
+    
+    def arrived(self, points):
+        if points.target_position == points.left_max:
+            pin = self.normal_pin
+        elif points.target_position == points.right_max:
+            pin = self.reverse_pin
+        else:
+            # Nothing to feel in the centre
+            return True
+        if pin.value() == self.closed:
+            self.stable_count += 1
+        else:
+            self.stable_count = 0
+        return self.stable_count >= self.stable_samples
+
+# Simulated feedback hardware for trying out the feedback without it fitted.
+# The points are modelled as taking lag_ms after the servo reaches its position
+# for the blades to arrive, unless stalled is set in which case they never do
+class SimulatedADC:
+    def __init__(self, lag_ms = 80, busy = 30000, quiet = 1000):
+        self.points = None
+        self.lag_ms = lag_ms
+        self.busy = busy
+        self.quiet = quiet
+        self.stalled = False
+    
+    def watch(self, points):
+        self.points = points
+    
+    def read_u16(self):
+        points = self.points
+        if self.stalled or points.direction:
+            return self.busy
+        if points.to_idle_start_ms and ticks_diff(ticks_ms(), points.to_idle_start_ms) < self.lag_ms:
+            return self.busy
+        return self.quiet
+
+class SimulatedPin:
+    def __init__(self, side, lag_ms = 80, closed = 0):
+        self.points = None
+        self.side = side
+        self.lag_ms = lag_ms
+        self.closed = closed
+        self.stalled = False
+    
+    def watch(self, points):
+        self.points = points
+    
+    def value(self):
+        points = self.points
+        if self.side == 'n':
+            position = points.left_max
+        else:
+            position = points.right_max
+        if self.stalled or points.direction or points.current_position != position:
+            return 1 - self.closed
+        if points.to_idle_start_ms and ticks_diff(ticks_ms(), points.to_idle_start_ms) < self.lag_ms:
+            return 1 - self.closed
+        return self.closed
@@ -0,0 +1,244 @@
+# Drivers for the hardware on the board, buttons and inputs, servos and the
+# watchdog
+
+from time import ticks_ms, ticks_us, ticks_diff
+from machine import Pin, PWM, WDT, Timer, mem32
+
+# Fixed size ring buffer of pressed buttons, the interrupt handlers add to it
+# and the main loop takes from it without either having to grow or shrink a list
+class ButtonQueue:
+    __slots__ = ('items', 'head', 'count', 'dropped')
+    
+    def __init__(self, size = 8):
+        self.items = [None] * size
+        self.head = 0
+        self.count = 0
+        self.dropped = 0
+    
+    def is_empty(self):
+        return self.count == 0
+    
+    def contains(self, item):
+        size = len(self.items)
+        for ndx in range(self.count):
+            if self.items[(self.head + ndx) % size] is item:
+                return True
+        return False
+    
+    def append(self, item):
+        size = len(self.items)
+        if self.count == size:
+            self.dropped += 1
+            return False
+        self.items[(self.head + self.count) % size] = item
+        self.count += 1
+        return True
+    
+    def pop(self):
+        if self.count == 0:
+            return None
+        item = self.items[self.head]
+        self.items[self.head] = None
+        self.head = (self.head + 1) % len(self.items)
+        self.count -= 1
+        return item
+    
+    def peek(self):
+        if self.count == 0:
+            return None
+        return self.items[self.head]
+
+class Button:
+    DEBOUNCE_TIME = 1000 # 1 second
+    
+    # With a scanner the button is read along with every other input on the
+    # GPIO bank, otherwise it has an interrupt of its own
+    def __init__(self, id, pin, button_queue, scanner = None):
+        self.id = id
+        self.button_queue = button_queue
+        self.last_pressed = ticks_ms()
+        self.pressed_us = ticks_us()
+        self.scanner = scanner
+        
+        self.button = Pin(pin, Pin.IN, Pin.PULL_DOWN)
+        # Hold on to the bound handler so that one is not created for each interrupt
+        self.set_handler(self._pressed)
+        if scanner:
+            scanner.add_button(pin, self)
+    
+    def set_handler(self, handler):
+        self._handler = handler
+        if not self.scanner:
+            self.button.irq(trigger = Pin.IRQ_RISING, handler = handler)
+        
+    def _pressed(self, pin):
+        now = ticks_ms()
+        if ticks_diff(now, self.last_pressed) > Button.DEBOUNCE_TIME and not self.button_queue.contains(self):
+            self.last_pressed = now
+            self.pressed_us = ticks_us()
+            self.button_queue.append(self)
+
+# Reads every input on the GPIO bank at once from the SIO GPIO_IN register at
+# a fixed rate and debounces them all together. Each input has a two bit
+# vertical counter, spread across the bits of ct0 and ct1, which counts the
+# samples that disagree with the debounced state and flips the state on the
+# fourth in a row. Rising edges of button inputs are handed to the button
+# handlers, which put them in the same queue as the button interrupts would.
+# The cost of a scan is the same however many inputs there are
+class InputScanner:
+    GPIO_IN = 0xd0000004 # SIO_BASE + 0x004 on the RP2040
+    MASK = 0x3FFFFFFF # GPIO 0 to 29
+    
+    def __init__(self, period_ms = 2, read = None):
+        self.period_ms = period_ms
+        # Anything returning the levels of the inputs as bits can stand in for the register
+        self.read = read
+        self.state = 0
+        self.ct0 = self.MASK
+        self.ct1 = self.MASK
+        self.button_mask = 0
+        self.buttons = []
+        self.scans = 0
+        self.timer = None
+        self._handler = self._tick
+    
+    def add_button(self, pin, button):
+        self.button_mask |= 1 << pin
+        self.buttons.append((1 << pin, button))
+    
+    # Until the scanner is started an input reads as this level, so that
+    # detectors read as clear when nothing is being scanned, as in a replay
+    def set_idle_level(self, pin, level):
+        if level:
+            self.state |= 1 << pin
+        else:
+            self.state &= ~(1 << pin)
+    
+    def start(self):
+        self.state = self.sample()
+        self.timer = Timer(mode = Timer.PERIODIC, period = self.period_ms, callback = self._handler)
+    
+    def sample(self):
+        if self.read:
+            return self.read() & self.MASK
+        return mem32[self.GPIO_IN] & self.MASK
+    
+    def _tick(self, timer):
+        self.scan()
+    
+    def scan(self):
+        self.scans += 1
+        changed = self.state ^ self.sample()
+        # Count down the inputs that differ, reset the count of the ones that do not
+        self.ct0 = ~(self.ct0 & changed) & self.MASK
+        self.ct1 = (self.ct0 ^ (self.ct1 & changed)) & self.MASK
+        changed &= self.ct0 & self.ct1
+        self.state ^= changed
+        
+        rising = changed & self.state & self.button_mask
+        if rising:
+            for mask, button in self.buttons:
+                if rising & mask:
+                    button._handler(None)
+    
+    def level(self, pin):
+        return (self.state >> pin) & 1
+
+# A track circuit occupancy detector read through the input scanner
+class OccupancyDetector:
+    def __init__(self, scanner, pin, occupied_level = 0, pull = Pin.PULL_UP):
+        self.scanner = scanner
+        self.pin = pin
+        self.occupied_level = occupied_level
+        self.input = Pin(pin, Pin.IN, pull)
+        scanner.set_idle_level(pin, 1 - occupied_level)
+    
+    def is_occupied(self):
+        return self.scanner.level(self.pin) == self.occupied_level
+
+# The hardware watchdog resets the board if it is not fed in time, it is fed
+# by the route loop while every activity is within its budget and by the idle
+# wait. A timer makes sure machine.idle() is woken well within the timeout
+class Watchdog:
+    TIMEOUT = 5000 # ms, the RP2040 allows up to 8388
+    
+    def __init__(self, timeout = TIMEOUT):
+        self.wdt = WDT(timeout = timeout)
+        self._handler = self._tick
+        self.timer = Timer(mode = Timer.PERIODIC, period = timeout // 4, callback = self._handler)
+    
+    def _tick(self, timer):
+        pass
+    
+    def feed(self):
+        self.wdt.feed()
+
+class Servo:
+    # Express MIN and MAX in terms of percentage of duty cycle across the frequency
+    # in this case MIN is 3% of 1/50 (1/FREQ) or 600,000ns and MAX is 12% of 1/50 or
+    # 2,400,000ns
+    FREQ = 50
+    MIN = int(1000000000 / FREQ / 100 * 3)
+    MAX = int(1000000000 / FREQ / 100 * 12)
+    MID = int(MIN + ((MAX - MIN) / 2))
+    OFF = 0
+
+    def __init__(self, pin):
+        self.control = PWM(Pin(pin))
+        self.control.freq(Servo.FREQ)
+        self.position_duty_cycle = None
+    
+    def center(self):
+        self._set_position(self.MID)
+        
+    def minimum(self):
+        self._set_position(self.MIN)
+    
+    def maximum(self):
+        self._set_position(self.MAX)
+    
+    # Positions are worked out with integer maths, on MicroPython every float
+    # result is a new object on the heap
+    def move_to_percentage(self, percentage):
+        if percentage < 0:
+            p = 0
+        elif percentage > 100:
+            p = 100
+        else:
+            p = percentage
+        duty_cycle = self.MIN + (self.MAX - self.MIN) * p // 100
+        self._set_position(duty_cycle)
+    
+    def get_position_as_percentage(self):
+        offset = self.position_duty_cycle - self.MIN
+        if offset != 0:
+            return offset / (self.MAX - self.MIN) * 100.0
+        else:
+            return 0
+        
+    def move_to_degree(self, degree):
+        if degree < -90:
+            d = -90
+        elif degree > 90:
+            d = 90
+        else:
+            d = degree
+        duty_cycle = self.MIN + (self.MAX - self.MIN) * (d + 90) // 180
+        self._set_position(duty_cycle)
+    
+    def get_position_as_degree(self):
+        offset = self.position_duty_cycle - self.MIN
+        if offset != 0:
+            return (offset / (self.MAX - self.MIN) * 180.0) - 90.0
+        else:
+            return -90
+    
+    def finish(self):
+        self.control.deinit()
+        
+    def idle(self):
+        self.control.duty_ns(0)
+    
+    def _set_position(self, position):
+        self.position_duty_cycle = int(position)
+        self.control.duty_ns(self.position_duty_cycle)
@@ -0,0 +1,238 @@
+from machine import Pin
+from neopixel import NeoPixel as Neopixel
+
+from scram.scheduler import scheduler
+
+class Indicators:
+    
+    BLACK = (0, 0, 0, 0)
+    RED = (50, 0, 0, 0)
+    GREEN = (0, 50, 0, 0)
+    YELLOW = (45, 27, 0, 0)
+    FAULT = (0, 0, 50, 0)
+    
+    # Writing the pixels takes well under a millisecond, anything longer than
+    # this means the loop has stalled
+    TIME_BUDGET = 20
+    
+    def __init__(self, indicator_count = 6, state_machine = 0, pin = 18, mode = 'GRB'):
+        self.id = id
+        self.count = indicator_count
+        self.pixels = Neopixel(Pin(pin), indicator_count, bpp = 4)
+        # The colour last set for each indicator, the colours are the shared class
+        # tuples so an unchanged indicator is spotted without building anything
+        self.colors = [None] * indicator_count
+        self.changed = False
+        self.set_passive()
+    
+    def set_color(self, indicator, color):
+        if self.colors[indicator] is not color:
+            self.colors[indicator] = color
+            self.pixels[indicator] = color
+            self.changed = True
+        
+    def black(self, indicator):
+        self.set_color(indicator, Indicators.BLACK)
+    
+    def red(self, indicator):
+         self.set_color(indicator, Indicators.RED)
+         
+    def green(self, indicator):
+        self.set_color(indicator, Indicators.GREEN)
+        
+    def yellow(self, indicator):
+        self.set_color(indicator, Indicators.YELLOW)
+    
+    # Every indicator is lit in the fault colour straight away
+    def fault(self):
+        for ndx in range(self.count):
+            self.set_color(ndx, Indicators.FAULT)
+        self.pixels.write()
+        self.changed = False
+        self.set_passive()
+    
+    def time_budget(self):
+        return self.TIME_BUDGET
+    
+    def has_failed(self):
+        return False
+    
+    def abort(self):
+        self.set_passive()
+    
+    def is_active(self):
+        return self.active
+    
+    def is_passive(self):
+        return not self.is_active()
+    
+    def set_active(self):
+        self.active = True
+        scheduler.activate(self)
+    
+    def set_passive(self):
+        self.active = False
+    
+    def update(self):
+        if self.is_active():
+            if self.changed:
+                self.pixels.write()
+                self.changed = False
+            self.set_passive()
+
+class WestPointsIndicators:
+    def __init__(self, indicators):
+        self.indicators = indicators
+        self.set_passive()
+    
+    def is_active(self):
+        return self.active or self.indicators.is_active()
+    
+    def is_passive(self):
+        return not self.is_active()
+    
+    def set_active(self):
+        self.indicators.set_active()
+        self.active = True
+    
+    def set_passive(self):
+        self.active = False
+    
+    def time_budget(self):
+        return self.indicators.time_budget()
+    
+    def has_failed(self):
+        return False
+    
+    def abort(self):
+        self.indicators.abort()
+        self.set_passive()
+    
+    def update(self):
+        if self.indicators.is_active():
+            self.indicators.update()
+            self.set_passive()
+    
+    def start_of_day(self):
+        self.indicators.red(0)
+        self.indicators.red(1)
+        self.indicators.set_active()
+    
+    def transition(self):
+        self.indicators.yellow(0)
+        self.indicators.yellow(1)
+        self.indicators.set_active()
+    
+    def normal(self):
+        self.indicators.green(0)
+        self.indicators.red(1)
+        self.indicators.set_active()
+    
+    def reverse(self):
+        self.indicators.red(0)
+        self.indicators.green(1)
+        self.indicators.set_active()
+
+class EastPointsIndicators:
+    def __init__(self, indicators):
+        self.indicators = indicators
+        self.set_passive()
+    
+    def is_active(self):
+        return self.active
+    
+    def is_passive(self):
+        return not self.is_active()
+    
+    def set_active(self):
+        self.active = True
+    
+    def set_passive(self):
+        self.active = False
+    
+    def time_budget(self):
+        return self.indicators.time_budget()
+    
+    def has_failed(self):
+        return False
+    
+    def abort(self):
+        self.indicators.abort()
+        self.set_passive()
+        
+    def update(self):
+        if self.indicators.is_active():
+            self.indicators.update()
+            self.set_passive()
+    
+    def start_of_day(self):
+        self.indicators.red(4)
+        self.indicators.red(5)
+        self.indicators.set_active()
+    
+    def transition(self):
+        self.indicators.yellow(4)
+        self.indicators.yellow(5)
+        self.indicators.set_active()
+    
+    def normal(self):
+        self.indicators.green(4)
+        self.indicators.red(5)
+        self.indicators.set_active()
+    
+    def reverse(self):
+        self.indicators.red(4)
+        self.indicators.green(5)
+        self.indicators.set_active()
+    
+class SouthPointsIndicators:
+    def __init__(self, indicators):
+        self.indicators = indicators
+        self.set_passive()
+    
+    def is_active(self):
+        return self.active
+    
+    def is_passive(self):
+        return not self.is_active()
+    
+    def set_active(self):
+        self.active = True
+    
+    def set_passive(self):
+        self.active = False
+    
+    def time_budget(self):
+        return self.indicators.time_budget()
+    
+    def has_failed(self):
+        return False
+    
+    def abort(self):
+        self.indicators.abort()
+        self.set_passive()
+    
+    def update(self):
+        if self.indicators.is_active():
+            self.indicators.update()
+            self.set_passive()
+    
+    def start_of_day(self):
+        self.indicators.red(2)
+        self.indicators.red(3)
+        self.indicators.set_active()
+    
+    def transition(self):
+        self.indicators.yellow(2)
+        self.indicators.yellow(3)
+        self.indicators.set_active()
+    
+    def normal(self):
+        self.indicators.green(2)
+        self.indicators.red(3)
+        self.indicators.set_active()
+    
+    def reverse(self):
+        self.indicators.red(2)
+        self.indicators.green(3)
+        self.indicators.set_active()
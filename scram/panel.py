@@ -0,0 +1,256 @@
+from time import sleep
+from machine import Pin, PWM
+
+from scram.scheduler import scheduler, IdleScheduler, GCMonitor, DeadlineMonitor
+from scram.hardware import ButtonQueue, Button, InputScanner, Watchdog
+from scram.points import Points
+from scram.signals import Signal
+from scram.indicators import Indicators, WestPointsIndicators, EastPointsIndicators, SouthPointsIndicators
+from scram.routes import Layout
+
+# The control panel, the route buttons and the feedback buzzer along with the
+# layout that they set routes on
+class Panel:
+    def __init__(self, layout, buttons, button_queue, feedback_buzzer, indicators):
+        self.layout = layout
+        self.buttons = buttons
+        self.button_queue = button_queue
+        self.feedback_buzzer = feedback_buzzer
+        self.idle_scheduler = IdleScheduler(button_queue)
+        self.deadline_monitor = DeadlineMonitor(indicators)
+        self.watchdog = None
+        self.gc_monitor = None
+        self.recorder = None
+        self.feedback = False
+        self.feedback_alter_count = 0
+        self.easter_egg_count = 0
+        self.whole_note_duration = 0
+    
+    def tone(self, freq, duration):
+        if freq > 0:
+            self.feedback_buzzer.freq(freq)
+            self.feedback_buzzer.duty_u16(1000)
+        sleep(duration)
+        self.feedback_buzzer.duty_u16(0)
+    
+    def play(self, note):
+        divider = note[1]
+        if divider > 0:
+            duration = self.whole_note_duration / divider
+        elif divider < 0:
+            # dotted note
+            duration = self.whole_note_duration / divider * (-1.5)
+        
+        self.tone(note[0], duration * 0.9)
+        sleep(duration * 0.1)
+        if self.watchdog:
+            self.watchdog.feed()
+    
+    def process(self, route):
+        if route is None:
+            print('Route refused, points occupied')
+            return
+        print('Processing', route.name)
+        self.gc_monitor.route_start()
+        self.deadline_monitor.route_start()
+        for step in route.steps:
+            if not self.process_step(route, step):
+                break
+        self.deadline_monitor.route_end()
+        self.gc_monitor.route_end()
+    
+    # Returns False if the step overran or failed and the route had to be abandoned
+    def process_step(self, route, step):
+        route.start_step(step)
+        self.deadline_monitor.step_start(step)
+        while scheduler.busy():
+            activity = self.deadline_monitor.overrun(step)
+            if activity:
+                route.abort_step(step)
+                self.deadline_monitor.fault(route, activity)
+                # The indicators now show the fault, the next route sets them all again
+                self.layout.forget_shown()
+                return False
+            scheduler.tick()
+        activity = route.failed(step)
+        if activity:
+            self.deadline_monitor.failure(route, activity)
+            self.layout.forget_shown()
+            return False
+        return True
+    
+    # Once started the watchdog cannot be stopped, so it is only started when
+    # asked for after the start of day
+    def start_watchdog(self):
+        self.watchdog = Watchdog()
+        self.idle_scheduler.watchdog = self.watchdog
+        self.deadline_monitor.watchdog = self.watchdog
+    
+    def start(self):
+        # Everything that the steady state loop needs has now been built, collect
+        # what was left over from setting up and hand control of the collector
+        # over to the idle windows between routes
+        self.gc_monitor = GCMonitor()
+        
+        print('All servos at neutral')
+        print('Waiting for 2 seconds')
+        sleep(2)
+        
+        print('Start of day, signals at danger, all points straight through')
+        self.process(self.layout.start_of_day())
+        self.gc_monitor.idle_collect()
+        self.gc_monitor.report()
+        sleep(2)
+    
+    # Deal with one button press, returns False when the exit button is pressed
+    def handle(self, button):
+        # Handle setting of feedback buzzer, three 'start of day' in a row
+        # flips the setting
+        if button.id == 'S':
+            self.feedback_alter_count += 1
+        else:
+            self.feedback_alter_count = 0
+            
+        if self.feedback_alter_count == 3:
+            self.feedback = not self.feedback
+            
+        if self.feedback:
+            self.tone(659, 0.2)
+        
+        # Handle easter egg tunes, press route A twice, route B once, route a twice and route B once
+        # and the next tune in sequence will be played
+        if button.id == 'A' and (self.easter_egg_count == 0 or self.easter_egg_count == 1 or self.easter_egg_count == 3 or self.easter_egg_count == 4):
+            self.easter_egg_count += 1
+        elif button.id == 'B' and (self.easter_egg_count == 2 or self.easter_egg_count == 5):
+            self.easter_egg_count += 1
+        else:
+            self.easter_egg_count = 0
+        if self.easter_egg_count == 6:
+            # The tunes are only loaded the first time one is played, they are
+            # most of the bytecode and are not needed to set routes
+            from scram.audio import Tunes
+            tempo, tune = Tunes.next()
+            self.whole_note_duration = 100 * 4 / tempo
+            for note in tune:
+                self.play(note)
+            self.easter_egg_count = 0
+            
+        if button.id == 'A':
+            print('route A')
+            self.process(self.layout.plan('Main line to platform'))
+        elif button.id == 'B':
+            print('route B')
+            self.process(self.layout.plan('Main line from platform'))
+        elif button.id == 'C':
+            print('route C')
+            self.process(self.layout.plan('Loop line'))
+        elif button.id == 'D':
+            print('route D')
+            self.process(self.layout.plan('Goods line'))
+        elif button.id == 'S':
+            print('Start of day')
+            self.process(self.layout.start_of_day())
+        elif button.id == 'X':
+            print('Exiting')
+            return False
+        return True
+    
+    # Nothing is moving once a route has been set, if no other route is
+    # waiting then this is the idle window where garbage can be collected
+    def idle_window(self):
+        if self.button_queue.is_empty():
+            if self.recorder:
+                self.recorder.save()
+            self.gc_monitor.idle_collect()
+            self.gc_monitor.report()
+            self.idle_scheduler.report()
+            self.deadline_monitor.report()
+    
+    def run(self):
+        print('Select a route by a button')
+        while True:
+            if self.button_queue.is_empty():
+                self.idle_scheduler.wait()
+            
+            # process the button press and remove button from the queue
+            if not self.handle(self.button_queue.pop()):
+                break
+            
+            self.idle_window()
+
+# The scanner is not started when the buttons are to be pressed by something
+# else, such as a replay, so that the live inputs are not mixed in
+def build(start_scanner = True):
+    feedback_buzzer = PWM(Pin(22))
+
+    pressed_buttons = ButtonQueue()
+    scanner = InputScanner()
+    buttons = []
+    buttons.append(Button('A', 2, pressed_buttons, scanner))
+    buttons.append(Button('B', 3, pressed_buttons, scanner))
+    buttons.append(Button('C', 4, pressed_buttons, scanner))
+    buttons.append(Button('D', 5, pressed_buttons, scanner))
+    buttons.append(Button('S', 16, pressed_buttons, scanner))
+    buttons.append(Button('X', 17, pressed_buttons, scanner))
+        
+    west_points = Points(15, invert = True)
+    east_points = Points(12, invert = True)
+    south_points = Points(13, invert = True)
+    # Points with feedback settle as soon as they are seen to arrive, with
+    # current sensing on an ADC pin or tie bar microswitches, for example
+    #
+    #     from machine import ADC
+    #     from scram.feedback import CurrentFeedback, SwitchFeedback
+    #     west_points = Points(15, invert = True, feedback = CurrentFeedback(ADC(Pin(26))))
+    #     east_points = Points(12, invert = True, feedback = SwitchFeedback(Pin(6, Pin.IN, Pin.PULL_UP),
+    #                                                                       Pin(7, Pin.IN, Pin.PULL_UP)))
+    #
+    # Live frogs have their polarity switched by relays on a chain of 74HC595
+    # shift registers as the blades pass the centre, for example
+    #
+    #     from machine import SPI
+    #     from scram.accessories import ShiftRegisterOutputs, FrogPolarity
+    #     outputs = ShiftRegisterOutputs(SPI(1, 1000000, sck = Pin(26), mosi = Pin(27)), latch_pin = 28)
+    #     FrogPolarity(west_points, outputs, 0)
+    #     FrogPolarity(east_points, outputs, 1)
+    
+    platform_signal = Signal(14)
+    
+    indicators = Indicators(6, pin = 1, mode = 'GRBW') # Neopixels controlled by pin 1
+    
+    west_points_indicators = WestPointsIndicators(indicators)
+    east_points_indicators = EastPointsIndicators(indicators)
+    south_points_indicators = SouthPointsIndicators(indicators)
+    
+    layout = Layout()
+    layout.add_points('west', west_points, west_points_indicators)
+    layout.add_points('east', east_points, east_points_indicators)
+    layout.add_points('south', south_points, south_points_indicators)
+    layout.add_signal('platform', platform_signal)
+    # Track circuits over points are read by the scanner along with the
+    # buttons, for example
+    #
+    #     from scram.hardware import OccupancyDetector
+    #     layout.add_points('yard', yard_points, yard_points_indicators, OccupancyDetector(scanner, 6))
+    
+    if start_scanner:
+        scanner.start()
+    
+    # Points on other boards are added to the layout through the bus master,
+    # they are thrown and waited on like local points, for example
+    #
+    #     from scram_bus import BusMaster
+    #     from machine import UART
+    #     bus = BusMaster(UART(1, 115200, tx = Pin(8), rx = Pin(9)), scheduler = scheduler)
+    #     layout.add_points('yard', bus.points(1, 0), yard_points_indicators)
+    
+    # Only the points that a route relies on are listed, the planner works out
+    # which of them actually need to move. Signals are put to danger along with
+    # the transition indicators and are only cleared once the points for the
+    # route have settled
+    layout.add_route('Main line to platform', {'west': 'n', 'east': 'n'}, clear = ('platform',))
+    layout.add_route('Main line from platform', {'west': 'n', 'east': 'n'})
+    layout.add_route('Loop line', {'west': 'r', 'east': 'r', 'south': 'n'})
+    layout.add_route('Goods line', {'south': 'r', 'west': 'r'})
+    
+    return Panel(layout, buttons, pressed_buttons, feedback_buzzer, indicators)
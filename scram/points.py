@@ -0,0 +1,233 @@
+from time import ticks_ms, ticks_diff, ticks_add, sleep
+
+from scram.scheduler import scheduler
+from scram.hardware import Servo
+
+class Points:
+    MAX_THROW = 45
+    # Beyond any throw so that it never matches a setting of a route
+    UNKNOWN_POSITION = 127
+    
+    def __init__(self, control_pin, left_max = 35, right_max = 35, move_speed = 30 / 1000, to_idle_period = 250, set_to = 'c', invert = False, feedback = None, arrival_timeout = 500):
+        if left_max > self.MAX_THROW:
+            self.left_max = -self.MAX_THROW
+        elif left_max < 0:
+            self.left_max = 0
+        else:
+            self.left_max = -left_max
+            
+        if right_max > self.MAX_THROW:
+            self.right_max = self.MAX_THROW
+        elif right_max < 0:
+            self.right_max = 0
+        else:
+            self.right_max = right_max
+        
+        self.control_pin = control_pin
+        self.servo = Servo(control_pin)
+        
+        self.move_speed = move_speed # Degrees per milisecond
+        # Whole degrees per second so that positions can be worked out with integer maths
+        self.move_speed_dps = int(move_speed * 1000)
+        
+        # With feedback the settle period ends as soon as the points are seen to
+        # have arrived rather than after to_idle_period, arrival_timeout is how
+        # long they are given to do so before it is treated as a fault
+        self.feedback = feedback
+        self.arrival_timeout = arrival_timeout
+        self.arrival_faults = 0
+        self.failed = False
+        
+        # Positions to call back on as the points pass them, such as the centre
+        # for switching the polarity of a live frog
+        self.thresholds = []
+        
+        self.move_start_ms = 0
+        self.current_position = 0
+        self.start_position = 0
+        self.target_position = 0
+        self.init_set_to = set_to
+        self.invert = invert
+        self.set_target_throw(set_to)
+        self._move_to(self.target_position)
+        # Give it 2/50 of a second to move
+        sleep(1.0 / 50.0 * 2.0)
+        self.servo.idle()
+        self.direction = 0
+        self.to_idle_period = to_idle_period
+        self.to_idle_start_ms = 0
+
+    def _move_to(self, position):
+        self.current_position = position
+        # If the degree position needs to be inverted because of what the Servo
+        # thinks of as left and right are the opposite of how we want the tracks
+        # from the turnout to run
+        degree = position
+        if self.invert:
+            degree *= -1
+        self.servo.move_to_degree(degree)
+
+    # Calls callback(points, direction) whenever the points move off position
+    # towards the other side of it, direction is 1 towards reverse and -1
+    # towards normal. It is called straight away for the side they are on now
+    def add_threshold(self, position, callback):
+        self.thresholds.append((position, callback))
+        if self.current_position > position:
+            callback(self, 1)
+        elif self.current_position < position:
+            callback(self, -1)
+    
+    def _cross_thresholds(self, old_position, new_position):
+        for ndx in range(len(self.thresholds)):
+            position, callback = self.thresholds[ndx]
+            if self.direction > 0:
+                if old_position <= position < new_position:
+                    callback(self, 1)
+            elif new_position < position <= old_position:
+                callback(self, -1)
+
+    def throw_left(self):
+        self.set_target_throw('l')
+        
+    def throw_right(self):
+        self.set_target_throw('r')
+        
+    def center(self):
+        self.set_target_throw('c')
+    
+    # The normal and reverse settings of the points model the way points are
+    # thought of in the real world, normal is straight on and reverse is a
+    # turn off. The arbitrary decision was made for the throw left to be
+    # straight on and throw right to be reverse because 'right' and 'reverse'
+    # both have an initial 'r' and 'r' also looks a bit like a a set of
+    # points with the branch to the right
+    def normal(self):
+        self.throw_left()
+    
+    def reverse(self):
+        self.throw_right()
+
+    def is_moving_to_target(self):
+        return self.direction != 0
+    
+    def is_on_target(self):
+        return not self.is_moving_to_target()
+    
+    def is_settling(self):
+        return self.to_idle_start_ms != 0
+    
+    def is_settled(self):
+        return not self.is_settling()
+    
+    def is_active(self):
+        return self.is_moving_to_target() or self.is_settling()
+
+    def is_passive(self):
+        return not self.is_active()
+    
+    # Worst case time in ms for the move under way to finish and settle
+    def time_budget(self):
+        move = abs(self.target_position - self.current_position) * 1000 // max(self.move_speed_dps, 1)
+        if self.feedback:
+            return move + self.arrival_timeout
+        return move + self.to_idle_period
+    
+    # True when the points gave up waiting for the blades to arrive
+    def has_failed(self):
+        return self.failed
+    
+    # Stop where it is and idle the servo. Where the blades are is no longer
+    # known, even if the servo has reached its angle, so the target is set to
+    # unknown and a route planned later will throw the points again. Being
+    # stopped while waiting for feedback means the points never arrived
+    def abort(self):
+        if self.feedback and self.direction == 0 and self.to_idle_start_ms:
+            self.arrival_faults += 1
+        self.target_position = self.UNKNOWN_POSITION
+        self.direction = 0
+        self.to_idle_start_ms = 0
+        self.servo.idle()
+
+    def set_target_throw(self, hand):
+        h = hand.lower()
+        if h == 'r':
+            self.set_target(self.right_max)
+        elif h == 'l':
+            self.set_target(self.left_max)
+        elif h == 'c':
+            self.set_target(0)
+
+    def set_target(self, target):
+        if self.current_position != target:
+            self.start_position = self.current_position
+            self.target_position = target
+            self.move_start_ms = ticks_ms()
+            if self.target_position < self.current_position:
+                self.direction = -1
+            else:
+                self.direction = 1
+            if self.feedback:
+                self.feedback.reset()
+            self.failed = False
+            scheduler.activate(self)
+        elif self.target_position == self.UNKNOWN_POSITION:
+            # Stopped at the angle after an abort, the servo is driven there
+            # again and the settle period, or the wait for arrival, starts over
+            self.target_position = target
+            self._move_to(target)
+            self.failed = False
+            if self.feedback:
+                self.feedback.reset()
+                scheduler.activate(self)
+            self._start_settling()
+
+    def _start_settling(self):
+        # Nothing is moving so indicate it by setting direction to zero and start
+        # the settle timer, with feedback it is polled on every tick otherwise
+        # nothing needs doing until the settle period is over
+        self.direction = 0
+        self.to_idle_start_ms = ticks_ms()
+        if not self.feedback:
+            scheduler.wake_at(self, ticks_add(self.to_idle_start_ms, self.to_idle_period + 1))
+
+    def update(self):
+        if self.direction:
+            t = ticks_diff(ticks_ms(), self.move_start_ms)
+            next_position = self.start_position + self.direction * (self.move_speed_dps * t // 1000)
+            if self.direction > 0:
+                if next_position > self.target_position:
+                    next_position = self.target_position
+            else:
+                if next_position < self.target_position:
+                    next_position = self.target_position
+            
+            if next_position != self.current_position:
+                if self.thresholds:
+                    self._cross_thresholds(self.current_position, next_position)
+                self._move_to(next_position)
+            
+            if self.target_position == self.current_position:
+                self._start_settling()
+            
+        if self.to_idle_start_ms:
+            if self.feedback:
+                # The servo keeps driving until the points are seen to arrive. If
+                # they have not within arrival_timeout the servo is idled and the
+                # points are left failed with their position unknown, whether or
+                # not a route is watching them
+                if self.feedback.arrived(self):
+                    self.servo.idle()
+                    self.to_idle_start_ms = 0
+                elif ticks_diff(ticks_ms(), self.to_idle_start_ms) > self.arrival_timeout:
+                    self.arrival_faults += 1
+                    self.failed = True
+                    self.target_position = self.UNKNOWN_POSITION
+                    self.to_idle_start_ms = 0
+                    self.servo.idle()
+            else:
+                t = ticks_diff(ticks_ms(), self.to_idle_start_ms)
+                if self.to_idle_period < t:
+                    # Reached the end of the settle period, put the servo into idle and
+                    # set the settle finish indicator
+                    self.servo.idle()
+                    self.to_idle_start_ms = 0
@@ -0,0 +1,184 @@
+from array import array
+
+class Activity:
+    __slots__ = ('_target', '_work')
+    
+    def __init__(self, target, work):
+        self._target = target
+        self._work = work
+
+# A route is a name and a sequence of steps, each step is a group of activities
+# that are started together and must all finish before the next step starts.
+# The steps are frozen into tuples when the route is built so that running a
+# route does not need to allocate anything
+class Route:
+    __slots__ = ('name', 'steps')
+    
+    def __init__(self, name, steps):
+        self.name = name
+        self.steps = tuple(tuple(step) for step in steps)
+    
+    def start_step(self, step):
+        for activity in step:
+            activity._work()
+    
+    # Returns an activity in the step that gave up rather than finishing, such
+    # as points whose blades were never seen to arrive, or None
+    def failed(self, step):
+        for activity in step:
+            if activity._target.has_failed():
+                return activity
+        return None
+    
+    def abort_step(self, step):
+        for activity in step:
+            if activity._target.is_active():
+                activity._target.abort()
+
+# The layout is the set of points, with the indicators that show how each one
+# is set, and the signals. Each route is held as a vector of the positions it
+# needs for the points it uses, and when a route is asked for the plan is
+# worked out from the live state of the points so only the points that are
+# not already set are thrown. Points that are already set skip the transition
+# aspect and have their indicators set once, in the first step
+class Layout:
+    NORMAL = 1
+    REVERSE = 2
+    
+    def __init__(self):
+        self.points = []
+        self.point_names = []
+        self.signals = []
+        self.names = {}
+        self.signal_names = {}
+        self.routes = {}
+        # What each set of indicators is showing, 0 is not yet known
+        self.shown = bytearray()
+        # Activities are built once here and shared by every plan
+        self.throw_normal = []
+        self.throw_reverse = []
+        self.show_transition = []
+        self.show_normal = []
+        self.show_reverse = []
+        self.show_start_of_day = []
+        self.signal_danger = []
+        self.signal_clear = []
+        self.occupancy = []
+    
+    # occupancy, if given, is the track circuit over the points, a route is
+    # refused while any of the points it uses are occupied
+    def add_points(self, name, points, indicators, occupancy = None):
+        self.names[name] = len(self.points)
+        self.points.append(points)
+        self.point_names.append(name)
+        self.occupancy.append(occupancy)
+        self.shown.append(0)
+        self.throw_normal.append(Activity(points, points.normal))
+        self.throw_reverse.append(Activity(points, points.reverse))
+        self.show_transition.append(Activity(indicators, indicators.transition))
+        self.show_normal.append(Activity(indicators, indicators.normal))
+        self.show_reverse.append(Activity(indicators, indicators.reverse))
+        self.show_start_of_day.append(Activity(indicators, indicators.start_of_day))
+    
+    def add_signal(self, name, signal):
+        self.signal_names[name] = len(self.signals)
+        self.signals.append(signal)
+        self.signal_danger.append(Activity(signal, signal.danger))
+        self.signal_clear.append(Activity(signal, signal.clear))
+    
+    # settings maps the name of each points used by the route to 'n' for
+    # normal or 'r' for reverse, clear names the signals cleared by the route
+    def add_route(self, name, settings, clear = ()):
+        index = bytearray()
+        setting = bytearray()
+        position = array('h')
+        for points_name in settings:
+            ndx = self.names[points_name]
+            points = self.points[ndx]
+            index.append(ndx)
+            if settings[points_name].lower() == 'n':
+                setting.append(self.NORMAL)
+                position.append(points.left_max)
+            else:
+                setting.append(self.REVERSE)
+                position.append(points.right_max)
+        signals = bytearray()
+        for signal_name in clear:
+            signals.append(self.signal_names[signal_name])
+        self.routes[name] = (bytes(index), bytes(setting), position, bytes(signals))
+    
+    def is_occupied(self, name):
+        index = self.routes[name][0]
+        for ndx in index:
+            if self.occupancy[ndx] and self.occupancy[ndx].is_occupied():
+                return True
+        return False
+    
+    # Returns None if the route cannot be set because its points are occupied
+    def plan(self, name):
+        if self.is_occupied(name):
+            return None
+        index, setting, position, signals = self.routes[name]
+        first = []
+        throws = []
+        last = []
+        
+        for ndx in range(len(self.signals)):
+            if self.signals[ndx].aspect != 'd' and ndx not in signals:
+                first.append(self.signal_danger[ndx])
+        
+        for n in range(len(index)):
+            ndx = index[n]
+            if self.points[ndx].target_position != position[n]:
+                first.append(self.show_transition[ndx])
+                if setting[n] == self.NORMAL:
+                    throws.append(self.throw_normal[ndx])
+                    last.append(self.show_normal[ndx])
+                else:
+                    throws.append(self.throw_reverse[ndx])
+                    last.append(self.show_reverse[ndx])
+                self.shown[ndx] = setting[n]
+            elif self.shown[ndx] != setting[n]:
+                if setting[n] == self.NORMAL:
+                    first.append(self.show_normal[ndx])
+                else:
+                    first.append(self.show_reverse[ndx])
+                self.shown[ndx] = setting[n]
+        
+        for ndx in signals:
+            if self.signals[ndx].aspect != 'c' or throws:
+                # Any signal being cleared over points that are moving has to
+                # be at danger while they move
+                if self.signals[ndx].aspect != 'd':
+                    first.append(self.signal_danger[ndx])
+                last.append(self.signal_clear[ndx])
+        
+        if not throws:
+            # Nothing to wait for so everything can be done in a single step
+            first.extend(last)
+            last = []
+        
+        return Route(name, [step for step in (first, throws, last) if step])
+    
+    # After a fault the indicators no longer show the state of the points
+    def forget_shown(self):
+        for ndx in range(len(self.shown)):
+            self.shown[ndx] = 0
+    
+    # Start of day puts every signal to danger, every set of points to normal
+    # and all of the indicators to their start of day aspect in one step
+    # Points that are occupied are left where they are, and as they are shown,
+    # rather than being thrown under a train
+    def start_of_day(self):
+        step = []
+        throws = []
+        for ndx in range(len(self.points)):
+            if self.occupancy[ndx] and self.occupancy[ndx].is_occupied():
+                print('Start of day, points', self.point_names[ndx], 'occupied, not thrown')
+                continue
+            step.append(self.show_start_of_day[ndx])
+            self.shown[ndx] = 0
+            throws.append(self.throw_normal[ndx])
+        step.extend(self.signal_danger)
+        step.extend(throws)
+        return Route('Start of day', [step])
@@ -0,0 +1,288 @@
+# The scheduler that decides which targets are updated on each tick, and the
+# monitors that keep an eye on the time, memory and idle share of the loop
+
+import gc
+from time import ticks_ms, ticks_us, ticks_diff
+from array import array
+from machine import idle, lightsleep
+
+# Keeps track of what needs attention so the loop only touches the objects that
+# are doing something. Anything moving is put in the active set by activate()
+# and is updated on every tick until it is no longer active. Anything that is
+# only waiting, such as points settling before the servo is idled, is taken out
+# of the active set by wake_at() and held in a min-heap of deadlines, it is
+# updated once when its deadline comes round. The cost of a tick depends on how
+# much is moving, not on the size of the layout
+class Scheduler:
+    def __init__(self, size = 16):
+        self.active = [None] * size
+        self.active_count = 0
+        self.deadlines = array('i', bytearray(4 * size))
+        self.waiting = [None] * size
+        self.waiting_count = 0
+        self.flushes = []
+    
+    # Anything that batches its output, such as the shift register outputs, is
+    # flushed once at the end of each tick after everything that might change
+    # it has been updated
+    def flush_after_tick(self, target):
+        self.flushes.append(target)
+    
+    def busy(self):
+        return self.active_count > 0 or self.waiting_count > 0
+    
+    def activate(self, target):
+        for ndx in range(self.active_count):
+            if self.active[ndx] is target:
+                return
+        if self.active_count == len(self.active):
+            self.active.extend([None] * len(self.active))
+        self.active[self.active_count] = target
+        self.active_count += 1
+    
+    def _deactivate(self, ndx):
+        self.active_count -= 1
+        self.active[ndx] = self.active[self.active_count]
+        self.active[self.active_count] = None
+    
+    def wake_at(self, target, deadline):
+        for ndx in range(self.active_count):
+            if self.active[ndx] is target:
+                self._deactivate(ndx)
+                break
+        if self.waiting_count == len(self.waiting):
+            self.waiting.extend([None] * len(self.waiting))
+            deadlines = array('i', bytearray(8 * len(self.deadlines)))
+            for ndx in range(self.waiting_count):
+                deadlines[ndx] = self.deadlines[ndx]
+            self.deadlines = deadlines
+        # Sift the new deadline up from the bottom of the heap
+        ndx = self.waiting_count
+        self.waiting_count += 1
+        while ndx > 0:
+            parent = (ndx - 1) >> 1
+            if ticks_diff(self.deadlines[parent], deadline) <= 0:
+                break
+            self.deadlines[ndx] = self.deadlines[parent]
+            self.waiting[ndx] = self.waiting[parent]
+            ndx = parent
+        self.deadlines[ndx] = deadline
+        self.waiting[ndx] = target
+    
+    def _pop(self):
+        target = self.waiting[0]
+        self.waiting_count -= 1
+        count = self.waiting_count
+        deadline = self.deadlines[count]
+        last = self.waiting[count]
+        self.waiting[count] = None
+        if count:
+            # Sift the last deadline down from the top of the heap
+            ndx = 0
+            while True:
+                child = 2 * ndx + 1
+                if child >= count:
+                    break
+                if child + 1 < count and ticks_diff(self.deadlines[child + 1], self.deadlines[child]) < 0:
+                    child += 1
+                if ticks_diff(deadline, self.deadlines[child]) <= 0:
+                    break
+                self.deadlines[ndx] = self.deadlines[child]
+                self.waiting[ndx] = self.waiting[child]
+                ndx = child
+            self.deadlines[ndx] = deadline
+            self.waiting[ndx] = last
+        return target
+    
+    def tick(self):
+        now = ticks_ms()
+        while self.waiting_count and ticks_diff(self.deadlines[0], now) <= 0:
+            self._pop().update()
+        
+        ndx = 0
+        while ndx < self.active_count:
+            target = self.active[ndx]
+            target.update()
+            if self.active[ndx] is not target:
+                # Moved itself on to the heap, what was last is now in this slot
+                continue
+            if target.is_active():
+                ndx += 1
+            else:
+                self._deactivate(ndx)
+        
+        for ndx in range(len(self.flushes)):
+            self.flushes[ndx].flush()
+
+scheduler = Scheduler()
+
+# When no route is being set the main loop waits here instead of spinning on
+# the button queue. Any settle periods still running are finished first so
+# that every servo has been idled, then the CPU is halted with machine.idle()
+# until the next interrupt, a button IRQ or the system tick, wakes it. With
+# lightsleep the clocks are stopped as well but the sleep is limited to
+# max_latency_ms so a press is always picked up within that time
+class IdleScheduler:
+    def __init__(self, button_queue, max_latency_ms = 20, use_lightsleep = False):
+        self.button_queue = button_queue
+        self.max_latency_ms = max_latency_ms
+        self.use_lightsleep = use_lightsleep
+        self.start_ms = ticks_ms()
+        self.idle_ms = 0
+        self.wakes = 0
+        self.last_latency_us = 0
+        self.max_latency_us = 0
+        self.watchdog = None
+    
+    def wait(self):
+        while scheduler.busy():
+            scheduler.tick()
+        
+        start = ticks_ms()
+        while self.button_queue.is_empty():
+            if self.watchdog:
+                self.watchdog.feed()
+            if self.use_lightsleep:
+                lightsleep(self.max_latency_ms)
+            else:
+                idle()
+        self.idle_ms += ticks_diff(ticks_ms(), start)
+        
+        # Wake up latency is from the button interrupt to the loop seeing it
+        self.wakes += 1
+        self.last_latency_us = ticks_diff(ticks_us(), self.button_queue.peek().pressed_us)
+        if self.last_latency_us > self.max_latency_us:
+            self.max_latency_us = self.last_latency_us
+    
+    def idle_share(self):
+        elapsed = ticks_diff(ticks_ms(), self.start_ms)
+        if elapsed <= 0:
+            return 0
+        return self.idle_ms * 100 // elapsed
+    
+    def report(self):
+        print('Idle: wake up latency', self.last_latency_us, 'us, max', self.max_latency_us,
+              'us, wakes', self.wakes, 'idle CPU share', self.idle_share(), '%')
+
+# Garbage collection is switched off once everything has been set up and is
+# only run in the idle windows between routes. The amount of memory allocated
+# while a route is being set is tracked, if it ever goes down then a collection
+# was forced while something was moving
+class GCMonitor:
+    def __init__(self):
+        self.idle_collections = 0
+        self.busy_collections = 0
+        self.route_allocated = 0
+        self.max_route_allocated = 0
+        self.alloc_at_start = 0
+        gc.collect()
+        gc.disable()
+    
+    def route_start(self):
+        self.alloc_at_start = gc.mem_alloc()
+    
+    def route_end(self):
+        allocated = gc.mem_alloc() - self.alloc_at_start
+        if allocated < 0:
+            self.busy_collections += 1
+            allocated = 0
+        self.route_allocated = allocated
+        if allocated > self.max_route_allocated:
+            self.max_route_allocated = allocated
+    
+    def idle_collect(self):
+        gc.collect()
+        self.idle_collections += 1
+    
+    def report(self):
+        print('GC: route allocated', self.route_allocated, 'bytes, max', self.max_route_allocated,
+              'bytes, collections while moving', self.busy_collections,
+              'idle collections', self.idle_collections, 'free', gc.mem_free())
+
+# Every activity in a step is given a time budget when the step starts, worked
+# out by its target from the distance to move, the speed and the settle period.
+# The route deadline is the sum of the longest budget in each step. An activity
+# still active once its budget, plus some slack, has run out has overrun, it is
+# reported and the route is abandoned with the fault shown on the indicators
+class DeadlineMonitor:
+    SLACK = 100 # ms
+    MAX_STEP = 32
+    
+    def __init__(self, indicators):
+        self.indicators = indicators
+        self.watchdog = None
+        self.budgets = array('i', bytearray(4 * self.MAX_STEP))
+        # The next point in the step at which some budget runs out
+        self.next_check = 0
+        self.step_start_ms = 0
+        self.route_start_ms = 0
+        self.route_deadline = 0
+        self.route_time = 0
+        self.overruns = 0
+        self.overrun_budget = 0
+        self.failures = 0
+        self.worst_margin = None
+    
+    def route_start(self):
+        self.route_start_ms = ticks_ms()
+        self.route_deadline = 0
+    
+    def step_start(self, step):
+        if len(step) > len(self.budgets):
+            self.budgets = array('i', bytearray(4 * len(step)))
+        longest = 0
+        shortest = -1
+        for ndx in range(len(step)):
+            budget = step[ndx]._target.time_budget() * 5 // 4 + self.SLACK
+            self.budgets[ndx] = budget
+            if budget > longest:
+                longest = budget
+            if shortest < 0 or budget < shortest:
+                shortest = budget
+        self.route_deadline += longest
+        self.next_check = shortest
+        self.step_start_ms = ticks_ms()
+    
+    # Returns the activity that has overrun its budget, or None while the step
+    # is on time, when it is on time the loop has made progress so the watchdog
+    # is fed. The activities are only looked at once a budget has run out
+    def overrun(self, step):
+        elapsed = ticks_diff(ticks_ms(), self.step_start_ms)
+        if elapsed > self.next_check:
+            self.next_check = -1
+            for ndx in range(len(step)):
+                budget = self.budgets[ndx]
+                if elapsed > budget:
+                    if step[ndx]._target.is_active():
+                        self.overrun_budget = budget
+                        return step[ndx]
+                elif self.next_check < 0 or budget < self.next_check:
+                    self.next_check = budget
+            if self.next_check < 0:
+                # Every budget has run out with nothing active, nothing to check
+                self.next_check = elapsed + self.SLACK
+        if self.watchdog:
+            self.watchdog.feed()
+        return None
+    
+    def route_end(self):
+        self.route_time = ticks_diff(ticks_ms(), self.route_start_ms)
+        margin = self.route_deadline - self.route_time
+        if self.worst_margin is None or margin < self.worst_margin:
+            self.worst_margin = margin
+    
+    def fault(self, route, activity):
+        self.overruns += 1
+        print('Fault:', route.name, 'abandoned,', type(activity._target).__name__,
+              'overran its budget of', self.overrun_budget, 'ms')
+        self.indicators.fault()
+    
+    def failure(self, route, activity):
+        self.failures += 1
+        print('Fault:', route.name, 'abandoned,', type(activity._target).__name__, 'failed')
+        self.indicators.fault()
+    
+    def report(self):
+        print('Deadline: route took', self.route_time, 'ms of', self.route_deadline,
+              'ms, closest margin', self.worst_margin, 'ms, overruns', self.overruns,
+              'failures', self.failures)
@@ -0,0 +1,206 @@
+from time import ticks_ms, ticks_diff, ticks_add, sleep
+from array import array
+
+from scram.scheduler import scheduler
+from scram.hardware import Servo
+
+# Semaphore signals driven by a servo. The bounce of the arm when it is lifted
+# to clear or dropped to danger is precomputed into a table of integer
+# keyframes so that moving a signal does no list building or float maths
+class Signal:
+    MAX_DOWN = 90
+    MIN_DOWN = 10
+    MAX_LIFT = 10
+    MIN_LIFT = 45
+    LIFT_BOUNCES = 2
+    DROP_BOUNCES = 4
+    # Degrees of overshoot added for each bounce still to come
+    LIFT_BOUNCE_SIZE = 2
+    DROP_BOUNCE_SIZE = 2
+    
+    def __init__(self, control_pin, danger_position = 90, clear_position = 45, drop_speed = 75, lift_speed = 25, to_idle_period = 250, set_to = 'd'):
+        if danger_position > self.MAX_DOWN:
+            self.danger_position = self.MAX_DOWN
+        elif danger_position < self.MIN_DOWN:
+            self.danger_position = self.MIN_DOWN
+        else:
+            self.danger_position = danger_position
+        
+        if clear_position < self.MAX_LIFT:
+            self.clear_position = self.MAX_LIFT
+        elif clear_position >= self.MIN_LIFT:
+            self.clear_position = self.MIN_LIFT
+        else:
+            self.clear_position = clear_position
+        
+        self.center_position = (self.clear_position + self.danger_position) // 2
+        
+        self.control_pin = control_pin
+        self.servo = Servo(control_pin)
+        
+        # Speeds are in whole degrees per second so that positions stay as integers
+        self.lift_speed = lift_speed
+        self.drop_speed = drop_speed
+        
+        # Keyframe table, the drop to danger sequence followed by the lift to
+        # clear sequence, each one ending on the resting position
+        frames = []
+        for ndx in range(self.DROP_BOUNCES + 1):
+            frames.append(self.danger_position)
+            frames.append(self.danger_position - self.DROP_BOUNCE_SIZE * (self.DROP_BOUNCES - ndx))
+        # The last bounce has no overshoot so drop the repeated resting position
+        frames.pop()
+        self.lift_start = len(frames)
+        for ndx in range(self.LIFT_BOUNCES + 1):
+            frames.append(self.clear_position)
+            frames.append(self.clear_position + self.LIFT_BOUNCE_SIZE * (self.LIFT_BOUNCES - ndx))
+        frames.pop()
+        self.frames = array('h', frames)
+        self.frame_ndx = 0
+        self.frame_end = 0
+        
+        self.move_start_ms = 0
+        self.current_position = 0
+        self.start_position = 0
+        self.target_position = 0
+        self.direction = 0
+        self.init_set_to = set_to
+        self.set_target_position(set_to)
+        # Go straight to the resting position without bouncing at power on
+        self.frame_ndx = self.frame_end
+        self._move_to(self.target_position)
+        # Give it 2/50 of a second to move
+        sleep(1.0 / 50.0 * 2.0)
+        self.servo.idle()
+        self.direction = 0
+        self.to_idle_period = to_idle_period
+        self.to_idle_start_ms = 0
+    
+    def _move_to(self, position):
+        self.current_position = position
+        self.servo.move_to_degree(position)
+    
+    def _start_frames(self, first, end):
+        self.frame_ndx = first
+        self.frame_end = end
+        self.set_target(self.frames[first])
+    
+    def danger(self):
+        self.aspect = 'd'
+        self._start_frames(0, self.lift_start)
+    
+    def clear(self):
+        self.aspect = 'c'
+        self._start_frames(self.lift_start, len(self.frames))
+    
+    def center(self):
+        self.aspect = '-'
+        self.frame_ndx = self.frame_end
+        self.set_target(self.center_position)
+    
+    def update(self):
+        if self.direction:
+            t = ticks_diff(ticks_ms(), self.move_start_ms)
+            if self.direction > 0:
+                next_position = self.start_position + self.drop_speed * t // 1000
+                if next_position > self.target_position:
+                    next_position = self.target_position
+            else:
+                next_position = self.start_position - self.lift_speed * t // 1000
+                if next_position < self.target_position:
+                    next_position = self.target_position
+            
+            if next_position != self.current_position:
+                self._move_to(next_position)
+            
+            if self.target_position == self.current_position:
+                # Reached target, if bouncing then move on to the next keyframe
+                self.frame_ndx += 1
+                if self.frame_ndx < self.frame_end:
+                    self.set_target(self.frames[self.frame_ndx])
+                    
+                if self.target_position == self.current_position:
+                    # Reached target so indicate stopping movement by setting direction to zero
+                    # and starting settle timer
+                    self.frame_ndx = self.frame_end
+                    self.direction = 0
+                    self.to_idle_start_ms = ticks_ms()
+                    scheduler.wake_at(self, ticks_add(self.to_idle_start_ms, self.to_idle_period + 1))
+            
+        if self.to_idle_start_ms:
+            t = ticks_diff(ticks_ms(), self.to_idle_start_ms)
+            if self.to_idle_period < t:
+                # Reached the end of the settle period, put the servo into idle and
+                # set the settle finish indicator
+                self.servo.idle()
+                self.to_idle_start_ms = 0
+
+    def is_moving_to_target(self):
+        return self.direction != 0
+
+    def is_on_target(self):
+        return not self.is_moving_to_target()
+
+    def is_settling(self):
+        return self.to_idle_start_ms != 0
+
+    def is_settled(self):
+        return not self.is_settling()
+
+    def is_active(self):
+        return self.is_moving_to_target() or self.is_settling()
+    
+    def is_passive(self):
+        return not self.is_active()
+    
+    # Worst case time in ms for the rest of the bounce sequence and the settle period
+    def time_budget(self):
+        time = 0
+        position = self.current_position
+        target = self.target_position
+        ndx = self.frame_ndx
+        while True:
+            if target > position:
+                time += (target - position) * 1000 // self.drop_speed
+            else:
+                time += (position - target) * 1000 // self.lift_speed
+            ndx += 1
+            if ndx >= self.frame_end:
+                break
+            position = target
+            target = self.frames[ndx]
+        return time + self.to_idle_period
+    
+    def has_failed(self):
+        return False
+    
+    # Stop where it is and idle the servo, the aspect is no longer known
+    def abort(self):
+        self.target_position = self.current_position
+        self.frame_ndx = self.frame_end
+        self.direction = 0
+        self.to_idle_start_ms = 0
+        self.aspect = '?'
+        self.servo.idle()
+
+    def set_target_position(self, flag):
+        f = flag.lower()
+        if f == 'd':
+            self.danger()
+        elif f == 'c':
+            self.clear()
+        elif f == '-':
+            self.center()
+
+    def set_target(self, target):
+        if self.current_position != target:
+            self.start_position = self.current_position
+            self.target_position = target
+            self.move_start_ms = ticks_ms()
+            if self.target_position < self.current_position:
+                self.direction = -1
+            else:
+                self.direction = 1
+            scheduler.activate(self)
+        else:
+            self.direction = 0
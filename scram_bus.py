@@ -0,0 +1,538 @@
+# SCRAM bus - points on other boards driven over a shared UART or RS-485 bus
+#
+# One board is the master, it holds the route table and sends point commands
+# to the other boards, the nodes, which each drive their own points. Every
+# frame looks like
+#
+#   0x7E, address, sequence, command, length, payload..., checksum
+#
+# the checksum being the sum of the bytes from the address to the end of the
+# payload. The master only ever has one request outstanding on the bus, every
+# request is answered by the node it was sent to, so the bus can be half duplex
+
+try:
+    from time import ticks_ms, ticks_diff
+except ImportError:
+    # Running under CPython with the loopback or pty stand-ins
+    import os
+    import select
+    import tty
+    from time import monotonic_ns
+
+    def ticks_ms():
+        return monotonic_ns() // 1000000
+
+    def ticks_diff(end, start):
+        return end - start
+
+START = 0x7E
+
+# Requests from the master
+SET = 0x01
+POLL = 0x02
+# Replies from a node
+ACK = 0x81
+STATUS = 0x82
+
+NORMAL = 1
+REVERSE = 2
+
+MAX_PAYLOAD = 32
+
+def encode(buffer, address, sequence, command, payload = b''):
+    length = len(payload)
+    buffer[0] = START
+    buffer[1] = address
+    buffer[2] = sequence
+    buffer[3] = command
+    buffer[4] = length
+    checksum = address + sequence + command + length
+    for ndx in range(length):
+        buffer[5 + ndx] = payload[ndx]
+        checksum += payload[ndx]
+    buffer[5 + length] = checksum & 0xFF
+    return 6 + length
+
+# Collects bytes as they arrive and hands back each complete frame with a good
+# checksum, anything else is thrown away until the next start byte
+class FrameReader:
+    def __init__(self):
+        self.frame = bytearray(6 + MAX_PAYLOAD)
+        self.payload = memoryview(self.frame)[5:5 + MAX_PAYLOAD]
+        self.count = 0
+        self.errors = 0
+        self.address = 0
+        self.sequence = 0
+        self.command = 0
+        self.length = 0
+
+    # Returns True when b completes a frame, the frame is then available from
+    # address, sequence, command, length and payload until the next call
+    def feed(self, b):
+        if self.count == 0:
+            if b == START:
+                self.frame[0] = b
+                self.count = 1
+            return False
+
+        self.frame[self.count] = b
+        self.count += 1
+        if self.count == 5 and self.frame[4] > MAX_PAYLOAD:
+            self.errors += 1
+            self.count = 0
+        elif self.count >= 6 and self.count == 6 + self.frame[4]:
+            self.count = 0
+            length = self.frame[4]
+            checksum = 0
+            for ndx in range(1, 5 + length):
+                checksum += self.frame[ndx]
+            if checksum & 0xFF != self.frame[5 + length]:
+                self.errors += 1
+                return False
+            self.address = self.frame[1]
+            self.sequence = self.frame[2]
+            self.command = self.frame[3]
+            self.length = length
+            return True
+        return False
+
+# Writes frames to the UART, with RS-485 the driver enable pin is raised for
+# the length of the write
+class Port:
+    def __init__(self, uart, direction = None):
+        self.uart = uart
+        self.direction = direction
+        self.tx = bytearray(6 + MAX_PAYLOAD)
+        self.rx = bytearray(16)
+        self.reader = FrameReader()
+        if direction:
+            direction.value(0)
+
+    def send(self, address, sequence, command, payload = b''):
+        length = encode(self.tx, address, sequence, command, payload)
+        if self.direction:
+            self.direction.value(1)
+        self.uart.write(self.tx[:length])
+        if self.direction:
+            self.uart.flush()
+            self.direction.value(0)
+
+    # Calls handle() with the reader for each complete frame that has arrived
+    def receive(self, handle):
+        while self.uart.any():
+            count = self.uart.readinto(self.rx)
+            if not count:
+                break
+            for ndx in range(count):
+                if self.reader.feed(self.rx[ndx]):
+                    handle(self.reader)
+
+class RemoteNode:
+    def __init__(self, address):
+        self.address = address
+        self.sequence = 0
+        # Settings waiting to go out in the next frame, pairs of points index and setting
+        self.pending = bytearray()
+        # The last SET frame, kept until it is acknowledged so it can be sent again
+        self.unacked = bytearray()
+        self.unacked_sequence = 0
+        # Bit masks of the points reported as still moving or settling, and of
+        # those that gave up waiting to arrive
+        self.active = 0
+        self.failed = 0
+        # Set when the node has been told to move something and has not yet
+        # reported its status since
+        self.stale = False
+        self.last_poll_ms = 0
+        # The RemotePoints for the points on the node
+        self.points = []
+
+    def is_busy(self):
+        return len(self.pending) > 0 or len(self.unacked) > 0 or self.stale or self.active != 0
+
+# Stands in for a local Points object on the master, it is thrown through the
+# bus and is only passive once the node reports it has settled. The positions
+# are symbolic so the route planner can compare them
+class RemotePoints:
+    # Covers getting the setting to the node and polling it until it settles
+    BUS_ALLOWANCE = 500 # ms
+
+    # The throws, speed and settle period are those of the points on the node,
+    # with feedback on the node give its arrival_timeout as the settle period
+    def __init__(self, master, node, index, left_max = 35, right_max = 35, move_speed = 30 / 1000, to_idle_period = 250):
+        self.master = master
+        self.node = node
+        self.index = index
+        self.left_max = -1
+        self.right_max = 1
+        self.target_position = 0
+        # Where the points are on the node is not known here, so the budget
+        # allows for a move all the way across
+        move = (left_max + right_max) * 1000 // max(int(move_speed * 1000), 1)
+        self.budget = move + to_idle_period + self.BUS_ALLOWANCE
+
+    def normal(self):
+        self.target_position = self.left_max
+        self.node.failed &= ~(1 << self.index)
+        self.master.queue(self.node, self.index, NORMAL)
+        self.master.activate(self)
+
+    def reverse(self):
+        self.target_position = self.right_max
+        self.node.failed &= ~(1 << self.index)
+        self.master.queue(self.node, self.index, REVERSE)
+        self.master.activate(self)
+
+    def is_active(self):
+        node = self.node
+        if node.stale or node.active & (1 << self.index):
+            return True
+        for ndx in range(0, len(node.pending), 2):
+            if node.pending[ndx] == self.index:
+                return True
+        for ndx in range(0, len(node.unacked), 2):
+            if node.unacked[ndx] == self.index:
+                return True
+        return False
+
+    def is_passive(self):
+        return not self.is_active()
+
+    def time_budget(self):
+        return self.budget
+
+    # Points that the node reports gave up waiting to arrive are where they
+    # are on the node, which is not known, a route planned later sets them again
+    def has_failed(self):
+        if self.node.failed & (1 << self.index):
+            self.target_position = 0
+            return True
+        return False
+
+    # Forget everything outstanding for the node. Settings for other points on
+    # the node are thrown away along with this one, so the targets of all of
+    # them go back to unknown and a route planned later will set them again
+    def abort(self):
+        self.node.pending = bytearray()
+        self.node.unacked = bytearray()
+        self.node.stale = False
+        self.node.active = 0
+        self.node.failed = 0
+        for points in self.node.points:
+            points.target_position = 0
+
+    def update(self):
+        self.master.update()
+
+class BusMaster:
+    REPLY_TIMEOUT = 50 # ms to wait for a node to answer
+    POLL_PERIOD = 20 # ms between status polls of a busy node
+
+    # The scheduler is the one from scram.scheduler that the routes are run on,
+    # remote points are put in its active set when they are thrown so that the
+    # bus is worked and the route waits for them while they move
+    def __init__(self, uart, scheduler, direction = None):
+        self.port = Port(uart, direction)
+        self.scheduler = scheduler
+        self.nodes = []
+        self.next_node = 0
+        self.waiting_for = None
+        self.sent_ms = 0
+        # The sequence of the last request, a reply to an earlier one that
+        # timed out is ignored
+        self.sent_sequence = 0
+        self.timeouts = 0
+        self.frames_sent = 0
+        self._handler = self._handle
+
+    def node(self, address):
+        for node in self.nodes:
+            if node.address == address:
+                return node
+        node = RemoteNode(address)
+        self.nodes.append(node)
+        return node
+
+    def points(self, address, index, left_max = 35, right_max = 35, move_speed = 30 / 1000, to_idle_period = 250):
+        node = self.node(address)
+        points = RemotePoints(self, node, index, left_max, right_max, move_speed, to_idle_period)
+        node.points.append(points)
+        return points
+
+    def queue(self, node, index, setting):
+        # A later setting for the same points replaces one not yet sent
+        for ndx in range(0, len(node.pending), 2):
+            if node.pending[ndx] == index:
+                node.pending[ndx + 1] = setting
+                return
+        node.pending.append(index)
+        node.pending.append(setting)
+
+    def is_busy(self):
+        for node in self.nodes:
+            if node.is_busy():
+                return True
+        return False
+
+    def activate(self, points):
+        self.scheduler.activate(points)
+
+    def _handle(self, frame):
+        node = self.waiting_for
+        if node is None or frame.address != node.address:
+            return
+        if frame.command == ACK and frame.sequence == node.unacked_sequence:
+            node.unacked = bytearray()
+            node.stale = True
+        elif frame.command == STATUS and frame.sequence == self.sent_sequence:
+            # The active mask followed by the failed mask, the same length each
+            half = frame.length >> 1
+            active = 0
+            failed = 0
+            for ndx in range(half):
+                active |= frame.payload[ndx] << (8 * ndx)
+                failed |= frame.payload[half + ndx] << (8 * ndx)
+            node.active = active
+            node.failed = failed
+            node.stale = False
+        else:
+            return
+        self.waiting_for = None
+
+    def update(self):
+        self.port.receive(self._handler)
+
+        now = ticks_ms()
+        if self.waiting_for is not None:
+            if ticks_diff(now, self.sent_ms) < self.REPLY_TIMEOUT:
+                return
+            # No answer, whatever was asked will be asked again
+            self.timeouts += 1
+            self.waiting_for = None
+
+        # Talk to the nodes in turn so a busy node cannot starve the others
+        count = len(self.nodes)
+        for n in range(count):
+            node = self.nodes[(self.next_node + n) % count]
+            if len(node.unacked) == 0 and len(node.pending) > 0:
+                # Everything queued for the node since the last frame goes in one
+                # frame, as many frames as it takes if there is more than a frame holds
+                node.sequence = (node.sequence + 1) & 0xFF
+                # The node ignores a SET with the same sequence as the last one,
+                # the polls in between must not have brought it back round to it
+                if node.sequence == node.unacked_sequence:
+                    node.sequence = (node.sequence + 1) & 0xFF
+                node.unacked = node.pending[:MAX_PAYLOAD]
+                node.unacked_sequence = node.sequence
+                node.pending = node.pending[MAX_PAYLOAD:]
+            if len(node.unacked) > 0:
+                self._send(node, node.unacked_sequence, SET, node.unacked, now)
+            elif (node.stale or node.active) and ticks_diff(now, node.last_poll_ms) >= self.POLL_PERIOD:
+                node.last_poll_ms = now
+                # Every poll has a sequence of its own so that its status can be
+                # told from that of a poll that timed out
+                node.sequence = (node.sequence + 1) & 0xFF
+                self._send(node, node.sequence, POLL, b'', now)
+            else:
+                continue
+            self.next_node = (self.next_node + n + 1) % count
+            return
+
+    def _send(self, node, sequence, command, payload, now):
+        self.port.send(node.address, sequence, command, payload)
+        self.sent_sequence = sequence
+        self.frames_sent += 1
+        self.waiting_for = node
+        self.sent_ms = now
+
+# Runs on each of the other boards, it applies the settings sent by the master
+# to its own points and answers polls with which of them are still active.
+# Points from scram put themselves in the scheduler from scram.scheduler when
+# they are thrown, the node ticks it to move them
+class BusNode:
+    def __init__(self, uart, address, points, scheduler, direction = None):
+        self.port = Port(uart, direction)
+        self.address = address
+        self.points = points
+        self.scheduler = scheduler
+        self.last_sequence = -1
+        # Which points are active then which have failed, a bit for each points
+        self.status = bytearray(2 * ((len(points) + 7) // 8))
+        self._handler = self._handle
+
+    def _handle(self, frame):
+        if frame.address != self.address:
+            return
+        if frame.command == SET:
+            # A repeated frame is only acknowledged again, the master missed the ack
+            if frame.sequence != self.last_sequence:
+                self.last_sequence = frame.sequence
+                for ndx in range(0, frame.length - 1, 2):
+                    index = frame.payload[ndx]
+                    if index < len(self.points):
+                        if frame.payload[ndx + 1] == NORMAL:
+                            self.points[index].normal()
+                        else:
+                            self.points[index].reverse()
+            self.port.send(self.address, frame.sequence, ACK)
+        elif frame.command == POLL:
+            for ndx in range(len(self.status)):
+                self.status[ndx] = 0
+            failed = len(self.status) >> 1
+            for ndx in range(len(self.points)):
+                if self.points[ndx].is_active():
+                    self.status[ndx >> 3] |= 1 << (ndx & 7)
+                if self.points[ndx].has_failed():
+                    self.status[failed + (ndx >> 3)] |= 1 << (ndx & 7)
+            self.port.send(self.address, frame.sequence, STATUS, self.status)
+
+    def update(self):
+        self.port.receive(self._handler)
+        self.scheduler.tick()
+
+    def run(self):
+        while True:
+            self.update()
+
+# In memory stand-in for a multi-drop bus, everything written by one port is
+# received by every other port on the bus
+class LoopbackBus:
+    def __init__(self):
+        self.ports = []
+
+    def uart(self):
+        port = LoopbackUART(self)
+        self.ports.append(port)
+        return port
+
+class LoopbackUART:
+    def __init__(self, bus):
+        self.bus = bus
+        self.buffer = bytearray()
+
+    def write(self, data):
+        for port in self.bus.ports:
+            if port is not self:
+                port.buffer.extend(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def any(self):
+        return len(self.buffer)
+
+    def readinto(self, buffer):
+        count = min(len(buffer), len(self.buffer))
+        buffer[:count] = self.buffer[:count]
+        del self.buffer[:count]
+        return count
+
+# Stand-in for machine.UART on Linux using a pseudo terminal, the other end
+# can be handed to another process or a serial tool by its name
+class PtyUART:
+    def __init__(self, fd):
+        tty.setraw(fd)
+        os.set_blocking(fd, False)
+        self.fd = fd
+
+    @staticmethod
+    def open():
+        controller, device = os.openpty()
+        return PtyUART(controller), PtyUART(device), os.ttyname(device)
+
+    def write(self, data):
+        return os.write(self.fd, bytes(data))
+
+    def flush(self):
+        pass
+
+    def any(self):
+        readable, _, _ = select.select([self.fd], [], [], 0)
+        return 1 if readable else 0
+
+    def readinto(self, buffer):
+        try:
+            data = os.read(self.fd, len(buffer))
+        except BlockingIOError:
+            return 0
+        buffer[:len(data)] = data
+        return len(data)
+
+# Exercise a master and two nodes on one Linux machine, over the loopback bus
+# or with 'pty' with the second node in a separate process on a pseudo terminal
+if __name__ == '__main__':
+    import sys
+
+    class SimulatedPoints:
+        MOVE_TIME = 300
+
+        def __init__(self):
+            self.start_ms = None
+
+        def normal(self):
+            self.start_ms = ticks_ms()
+
+        def reverse(self):
+            self.start_ms = ticks_ms()
+
+        def is_active(self):
+            return self.start_ms is not None
+
+        def has_failed(self):
+            return False
+
+        def update(self):
+            if self.start_ms is not None and ticks_diff(ticks_ms(), self.start_ms) >= self.MOVE_TIME:
+                self.start_ms = None
+
+    # Stands in for the scram scheduler, which needs the board, the loop below
+    # works the master itself and a node updates all of its points on each tick
+    class SimulatedScheduler:
+        def __init__(self, targets = ()):
+            self.targets = targets
+
+        def activate(self, target):
+            pass
+
+        def tick(self):
+            for target in self.targets:
+                target.update()
+
+    def simulated_node(uart, address):
+        points = [SimulatedPoints(), SimulatedPoints()]
+        return BusNode(uart, address, points, SimulatedScheduler(points))
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'pty':
+        master_uart, far_uart, name = PtyUART.open()
+        if os.fork() == 0:
+            node = simulated_node(far_uart, 2)
+            start = ticks_ms()
+            while ticks_diff(ticks_ms(), start) < 3000:
+                node.update()
+            os._exit(0)
+        print('Node 2 on', name)
+        nodes = []
+    else:
+        bus = LoopbackBus()
+        master_uart = bus.uart()
+        nodes = [simulated_node(bus.uart(), 1), simulated_node(bus.uart(), 2)]
+
+    master = BusMaster(master_uart, SimulatedScheduler())
+    route = [master.points(2, 0), master.points(2, 1)]
+    if nodes:
+        route += [master.points(1, 0), master.points(1, 1)]
+
+    start = ticks_ms()
+    for n, points in enumerate(route):
+        if n & 1:
+            points.reverse()
+        else:
+            points.normal()
+    while any(points.is_active() for points in route):
+        for points in route:
+            points.update()
+        for node in nodes:
+            node.update()
+    print('Route set over the bus in', ticks_diff(ticks_ms(), start), 'ms,', master.frames_sent,
+          'frames sent,', master.timeouts, 'timeouts,', master.port.reader.errors, 'bad frames')
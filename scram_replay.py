@@ -0,0 +1,220 @@
+# SCRAM session recording and replay
+#
+# A SessionRecorder captures every button press of a real session, before
+# any debouncing, with the time since the recording started. The recording is
+# saved as a four byte header followed by three bytes for each event, the
+# milliseconds since the previous event as a little endian 16 bit number and
+# the id of the button. Gaps too long for 16 bits are made up of filler events
+# with an id of zero.
+#
+# replay() builds the panel as main.py does and feeds a recording into the
+# buttons under a virtual clock. Time on the clock runs at speed times real
+# time and jumps straight over sleeps and idle waits, events are delivered as
+# if from the button interrupts, even in the middle of setting a route.
+#
+#     import scram_replay
+#     scram_replay.replay('session.scr', speed = 20)
+
+from array import array
+from time import ticks_ms, ticks_us, ticks_diff
+
+MAGIC = b'SCR\x01'
+FILLER = 0
+MAX_GAP = 0xFFFF
+TICKS_PERIOD = 1 << 30
+
+class SessionRecorder:
+    def __init__(self, buttons, path, size = 1024):
+        self.path = path
+        self.times = array('I', bytearray(4 * size))
+        self.ids = bytearray(size)
+        self.count = 0
+        self.saved = 0
+        self.dropped = 0
+        self.start_ms = ticks_ms()
+        # Put the recorder in front of each button's own handler
+        for button in buttons:
+            button.set_handler(self._make_handler(button))
+
+    def _make_handler(self, button):
+        id = ord(button.id)
+        handler = button._handler
+
+        def record(pin):
+            if self.count < len(self.ids):
+                self.times[self.count] = ticks_diff(ticks_ms(), self.start_ms)
+                self.ids[self.count] = id
+                self.count += 1
+            else:
+                self.dropped += 1
+            handler(pin)
+
+        return record
+
+    # Only writes when there is something new, call it from the idle window
+    def save(self):
+        if self.count == self.saved:
+            return
+        count = self.count
+        with open(self.path, 'wb') as f:
+            f.write(MAGIC)
+            record = bytearray(3)
+            last = 0
+            for ndx in range(count):
+                gap = self.times[ndx] - last
+                last = self.times[ndx]
+                while gap > MAX_GAP:
+                    record[0] = MAX_GAP & 0xFF
+                    record[1] = MAX_GAP >> 8
+                    record[2] = FILLER
+                    f.write(record)
+                    gap -= MAX_GAP
+                record[0] = gap & 0xFF
+                record[1] = gap >> 8
+                record[2] = self.ids[ndx]
+                f.write(record)
+        self.saved = count
+
+# Returns the recording as a list of (milliseconds since the start, button id)
+def load(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:4] != MAGIC:
+        raise ValueError('not a SCRAM session recording')
+    events = []
+    time = 0
+    for ndx in range(4, len(data) - 2, 3):
+        time += data[ndx] | (data[ndx + 1] << 8)
+        if data[ndx + 2] != FILLER:
+            events.append((time, chr(data[ndx + 2])))
+    return events
+
+class SessionEnd(Exception):
+    pass
+
+class VirtualClock:
+    def __init__(self, speed = 1):
+        self.speed = speed
+        self.last_real_us = ticks_us()
+        self.now_us = 0
+        self.start_us = 0
+        self.events = []
+        self.next_event = 0
+        self.button_queue = None
+        self.delivering = False
+        self.delivered = 0
+        self.dropped = 0
+
+    # Replace the time functions used by scram with the ones on this clock, in
+    # each of the modules that imported them
+    def install(self, modules):
+        for module in modules:
+            for name in ('ticks_ms', 'ticks_us', 'sleep', 'idle', 'lightsleep'):
+                if hasattr(module, name):
+                    setattr(module, name, getattr(self, name))
+
+    # events are (milliseconds from now, button) pairs
+    def begin(self, events, button_queue):
+        self._advance()
+        self.start_us = self.now_us
+        self.events = events
+        self.next_event = 0
+        self.button_queue = button_queue
+
+    def elapsed_ms(self):
+        return (self.now_us - self.start_us) // 1000
+
+    def _advance(self):
+        real_us = ticks_us()
+        self.now_us += int(ticks_diff(real_us, self.last_real_us) * self.speed)
+        self.last_real_us = real_us
+
+    def _event_us(self):
+        return self.start_us + self.events[self.next_event][0] * 1000
+
+    # Press every button whose time has come, as the interrupt would have done
+    def _deliver(self):
+        if self.delivering:
+            return
+        self.delivering = True
+        while self.next_event < len(self.events) and self._event_us() <= self.now_us:
+            button = self.events[self.next_event][1]
+            self.next_event += 1
+            count = self.button_queue.count
+            button._pressed(None)
+            self.delivered += 1
+            if self.button_queue.count == count:
+                self.dropped += 1
+        self.delivering = False
+
+    def ticks_us(self):
+        self._advance()
+        self._deliver()
+        return self.now_us & (TICKS_PERIOD - 1)
+
+    def ticks_ms(self):
+        self._advance()
+        self._deliver()
+        return (self.now_us // 1000) & (TICKS_PERIOD - 1)
+
+    def sleep(self, seconds):
+        self._advance()
+        self.now_us += int(seconds * 1000000)
+        self._deliver()
+
+    # Waiting for an interrupt goes straight to the next event
+    def idle(self):
+        self._advance()
+        if self.next_event >= len(self.events):
+            raise SessionEnd()
+        event_us = self._event_us()
+        if event_us > self.now_us:
+            self.now_us = event_us
+        self._deliver()
+
+    def lightsleep(self, ms = 0):
+        self.idle()
+
+def replay(path, speed = 1):
+    from scram import scheduler, hardware, points, signals, feedback, panel as scram_panel
+
+    recording = load(path)
+    clock = VirtualClock(speed)
+    clock.install((scheduler, hardware, points, signals, feedback, scram_panel))
+    # Only the recording presses the buttons, the live inputs are not scanned
+    panel = scram_panel.build(start_scanner = False)
+    panel.start()
+
+    buttons = {}
+    for button in panel.buttons:
+        buttons[button.id] = button
+    events = []
+    for time, id in recording:
+        if id in buttons:
+            events.append((time, buttons[id]))
+    clock.begin(events, panel.button_queue)
+
+    latencies = []
+    try:
+        while True:
+            if panel.button_queue.is_empty():
+                panel.idle_scheduler.wait()
+            button = panel.button_queue.pop()
+            # A button is only ever queued once, so when it is taken from the
+            # queue this is the time of its press. It is kept before the route is
+            # set as another press of the same button while it is being set
+            # overwrites it
+            pressed_ms = button.last_pressed
+            if not panel.handle(button):
+                break
+            # From the press being accepted to the route being set
+            latencies.append((button.id, ticks_diff(clock.ticks_ms(), pressed_ms)))
+            panel.idle_window()
+    except SessionEnd:
+        pass
+
+    print('Replay:', len(events), 'events,', clock.delivered, 'delivered,', clock.dropped,
+          'dropped, session time', clock.elapsed_ms(), 'ms')
+    for id, latency in latencies:
+        print('Route', id, 'latency', latency, 'ms')
+    return clock.elapsed_ms(), latencies, clock.dropped